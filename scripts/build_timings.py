@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+build_timings.py - Record build step timings and schedule asset jobs by predicted cost
+
+Subcommands:
+    run STEP -- CMD...   Run CMD and append its duration to the timing database
+    plan                 Show what would rebuild and the predicted cost
+    report               Show the recorded history per step
+    assets               Run asset generators in parallel, longest jobs first
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Get absolute path to project root (parent of scripts directory)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Kept outside build/ so the history survives 'make clean'
+DEFAULT_DB = os.path.join(PROJECT_ROOT, '.build_timings.db')
+
+# Number of recent successful runs used for predictions
+HISTORY_WINDOW = 5
+
+CONFIG_FILE = 'includes/asset_config.json'
+COLORS_FILE = 'settings/setcolor_generated.tex'
+
+# Asset jobs: step name -> (command, outputs, inputs)
+ASSET_JOBS = {
+    'resolve_project_colors': (
+        ['python3', 'scripts/resolve_project_colors.py'],
+        [COLORS_FILE],
+        ['scripts/resolve_project_colors.py', CONFIG_FILE],
+    ),
+    'generate_cover': (
+        ['python3', 'scripts/generate_cover.py'],
+        ['capas/cover.png'],
+        ['scripts/generate_cover.py', CONFIG_FILE, COLORS_FILE],
+    ),
+    'generate_background': (
+        ['python3', 'scripts/generate_background.py'],
+        ['capas/background.png'],
+        ['scripts/generate_background.py', CONFIG_FILE, COLORS_FILE],
+    ),
+    'generate_background_pretex': (
+        ['python3', 'scripts/generate_background_pretex.py'],
+        ['capas/background_pretex.png'],
+        ['scripts/generate_background_pretex.py', CONFIG_FILE, COLORS_FILE],
+    ),
+}
+
+# Asset jobs that must finish before the others start
+ASSET_PREREQUISITES = ['resolve_project_colors']
+
+# Steps of the full 'make' document build, per phase of the $(PDF) rule.
+# Phase 2 runs every asset generator again (after clean-assets) in parallel.
+PHASE1_STEPS = ['xelatex-pass1', 'makeglossaries', 'bibtex', 'xelatex-pass2', 'xelatex-pass3']
+PHASE3_STEPS = ['xelatex-final']
+POSTPROCESS_STEP = 'optimize-pdf'
+
+# Phase 1 steps that only run when the document has glossaries/citations
+CONDITIONAL_STEPS = ['makeglossaries', 'bibtex']
+
+# Prerequisites of $(PDF): the TEX_FILES and IMG_FILES wildcards of the Makefile
+DOCUMENT_SOURCES = [
+    '*.tex', 'caps/*.tex', 'settings/*.tex', 'siglas/*.tex',
+    'images/*.png', 'images/*.jpg', 'images/*.pdf', 'images/*.eps',
+]
+
+def connect(db_path):
+    """Open the timing database, creating the schema on first use"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS runs ('
+        ' id INTEGER PRIMARY KEY,'
+        ' step TEXT NOT NULL,'
+        ' started REAL NOT NULL,'
+        ' duration REAL NOT NULL,'
+        ' returncode INTEGER NOT NULL)'
+    )
+    conn.execute('CREATE INDEX IF NOT EXISTS runs_step ON runs (step, started)')
+    return conn
+
+def record(db_path, step, started, duration, returncode):
+    """Append one step timing"""
+    with connect(db_path) as conn:
+        conn.execute(
+            'INSERT INTO runs (step, started, duration, returncode) VALUES (?, ?, ?, ?)',
+            (step, started, duration, returncode),
+        )
+    conn.close()
+
+def predict(conn, step):
+    """Predicted duration of a step (median of recent successful runs), or None"""
+    rows = conn.execute(
+        'SELECT duration FROM runs WHERE step = ? AND returncode = 0 ORDER BY started DESC LIMIT ?',
+        (step, HISTORY_WINDOW),
+    ).fetchall()
+    if not rows:
+        return None
+    return statistics.median(row[0] for row in rows)
+
+def format_seconds(seconds):
+    """Format a duration for display"""
+    if seconds is None:
+        return 'n/a'
+    return f'{seconds:.1f}s'
+
+def run_timed(db_path, step, cmd, cwd=None):
+    """Run a command, record its duration and return its exit code"""
+    started = time.time()
+    start = time.perf_counter()
+    try:
+        returncode = subprocess.call(cmd, cwd=cwd)
+    except FileNotFoundError:
+        print(f"❌ Command not found: {cmd[0]}")
+        returncode = 127
+    record(db_path, step, started, time.perf_counter() - start, returncode)
+    return returncode
+
+# ========================================
+# Staleness (mirrors the Makefile rules)
+# ========================================
+
+def newest_mtime(patterns):
+    """Newest modification time among files matching glob patterns (like $(wildcard), not recursive)"""
+    newest = 0.0
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(PROJECT_ROOT, pattern)):
+            if os.path.isfile(path):
+                newest = max(newest, os.path.getmtime(path))
+    return newest
+
+def is_stale(outputs, inputs):
+    """True if any output is missing or older than the newest input"""
+    output_paths = [os.path.join(PROJECT_ROOT, path) for path in outputs]
+    if not all(os.path.exists(path) for path in output_paths):
+        return True
+    oldest_output = min(os.path.getmtime(path) for path in output_paths)
+    return newest_mtime(inputs) > oldest_output
+
+def stale_assets():
+    """Asset jobs that would be regenerated, following prerequisites"""
+    stale = [step for step, (_, outputs, inputs) in ASSET_JOBS.items() if is_stale(outputs, inputs)]
+    # A stale color file makes every generator stale too
+    if 'resolve_project_colors' in stale:
+        stale = list(ASSET_JOBS)
+    return stale
+
+def document_stale():
+    """True if main.pdf would be rebuilt"""
+    return is_stale(['main.pdf'], DOCUMENT_SOURCES)
+
+# ========================================
+# Subcommands
+# ========================================
+
+def cmd_run(args):
+    """Run a single timed step"""
+    cmd = args.cmd[1:] if args.cmd and args.cmd[0] == '--' else args.cmd
+    if not cmd:
+        print("❌ No command given (usage: build_timings.py run STEP -- CMD...)")
+        return 2
+    return run_timed(args.db, args.step, cmd, cwd=args.cwd)
+
+def cmd_plan(args):
+    """Show what would rebuild and the predicted cost, following the Makefile phases"""
+    conn = connect(args.db)
+    assets = stale_assets()
+    # $(PDF) does not depend on the PNGs; only the regenerated color file is a TeX input
+    document = document_stale() or 'resolve_project_colors' in assets
+
+    print("📋 Build plan")
+    print("=========================================")
+
+    if not assets and not document:
+        print("✅ Everything is up to date")
+        conn.close()
+        return 0
+
+    total = 0.0
+    unknown = []
+
+    def show(step, predicted):
+        nonlocal total
+        if predicted is None:
+            unknown.append(step)
+        else:
+            total += predicted
+        print(f"  {step:<28} {format_seconds(predicted):>8}")
+
+    # Stale assets are prerequisites of 'all' and regenerate serially first
+    if assets:
+        print("Stale assets:")
+        for step in assets:
+            show(step, predict(conn, step))
+
+    if document:
+        print("Phase 1:")
+        for step in PHASE1_STEPS:
+            predicted = predict(conn, step)
+            if predicted is None and step in CONDITIONAL_STEPS:
+                continue
+            show(step, predicted)
+
+        generators = [step for step in ASSET_JOBS if step not in ASSET_PREREQUISITES]
+        print(f"Phase 2 ({args.jobs} parallel job(s), critical path):")
+        for step in schedule(conn, generators):
+            predicted = predict(conn, step)
+            if predicted is None:
+                unknown.append(step)
+            print(f"  {step:<28} {format_seconds(predicted):>8}")
+        phase2 = critical_path(conn, generators, args.jobs)
+        total += phase2
+        print(f"  {'= critical path':<28} {format_seconds(phase2):>8}")
+
+        print("Phase 3:")
+        for step in PHASE3_STEPS + ([POSTPROCESS_STEP] if args.postprocess else []):
+            show(step, predict(conn, step))
+    conn.close()
+
+    print("-----------------------------------------")
+    print(f"  {'Predicted total':<28} {format_seconds(total):>8}")
+    if unknown:
+        print(f"  ⚠️  {len(set(unknown))} step(s) without history; run 'make' once to record them")
+    return 0
+
+def cmd_report(args):
+    """Show recorded history per step"""
+    conn = connect(args.db)
+    rows = conn.execute(
+        'SELECT step, COUNT(*), MIN(duration), MAX(duration), SUM(returncode != 0)'
+        ' FROM runs GROUP BY step ORDER BY step'
+    ).fetchall()
+    if not rows:
+        print("No timings recorded yet.")
+        conn.close()
+        return 0
+
+    print(f"  {'Step':<28} {'Runs':>5} {'Median':>8} {'Min':>8} {'Max':>8} {'Failed':>7}")
+    for step, count, fastest, slowest, failed in rows:
+        print(f"  {step:<28} {count:>5} {format_seconds(predict(conn, step)):>8} "
+              f"{format_seconds(fastest):>8} {format_seconds(slowest):>8} {failed:>7}")
+    conn.close()
+    return 0
+
+def schedule(conn, steps):
+    """Order steps longest predicted first; steps without history go first"""
+    def cost(step):
+        predicted = predict(conn, step)
+        return float('inf') if predicted is None else predicted
+    return sorted(steps, key=cost, reverse=True)
+
+def critical_path(conn, steps, jobs):
+    """Wall time of running steps on `jobs` workers in schedule() order (unknown steps cost 0)"""
+    workers = [0.0] * max(1, jobs)
+    for step in schedule(conn, steps):
+        # Each job starts on the first worker to become free
+        index = workers.index(min(workers))
+        workers[index] += predict(conn, step) or 0.0
+    return max(workers)
+
+def cmd_assets(args):
+    """Run asset generators in parallel, longest jobs first"""
+    steps = list(ASSET_JOBS) if args.all else stale_assets()
+    if not steps:
+        print("✅ Assets are up to date")
+        return 0
+
+    conn = connect(args.db)
+    first = [step for step in ASSET_PREREQUISITES if step in steps]
+    rest = schedule(conn, [step for step in steps if step not in ASSET_PREREQUISITES])
+    conn.close()
+
+    for step in first:
+        if run_timed(args.db, step, ASSET_JOBS[step][0], cwd=PROJECT_ROOT) != 0:
+            print(f"❌ {step} failed")
+            return 1
+
+    print(f"🚀 Running {len(rest)} asset job(s) with {args.jobs} worker(s): {', '.join(rest)}")
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(
+            lambda step: (step, run_timed(args.db, step, ASSET_JOBS[step][0], cwd=PROJECT_ROOT)),
+            rest,
+        ))
+
+    failed = [step for step, returncode in results if returncode != 0]
+    if failed:
+        print(f"❌ Failed asset jobs: {', '.join(failed)}")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Build step timings and scheduling")
+    parser.add_argument('--db', default=os.environ.get('BUILD_TIMINGS_DB', DEFAULT_DB),
+                        help="timing database (default: .build_timings.db)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="run and time one build step")
+    run_parser.add_argument('step', help="step name, e.g. xelatex-pass1")
+    run_parser.add_argument('--cwd', default=None, help="working directory for the command")
+    run_parser.add_argument('cmd', nargs=argparse.REMAINDER, help="-- command to run")
+    run_parser.set_defaults(func=cmd_run)
+
+    plan_parser = subparsers.add_parser('plan', help="show what would rebuild and its predicted cost")
+    plan_parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                             help="parallel asset workers in Phase 2 (default: CPU count)")
+    plan_parser.add_argument('--postprocess', type=int, choices=(0, 1), default=1,
+                             help="count the final-PDF post-processing step (default: 1)")
+    plan_parser.set_defaults(func=cmd_plan)
+
+    report_parser = subparsers.add_parser('report', help="show recorded timings per step")
+    report_parser.set_defaults(func=cmd_report)
+
+    assets_parser = subparsers.add_parser('assets', help="generate assets in parallel, longest first")
+    assets_parser.add_argument('--all', action='store_true', help="regenerate every asset, stale or not")
+    assets_parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                               help="parallel workers (default: CPU count)")
+    assets_parser.set_defaults(func=cmd_assets)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+doc_stats.py - Document statistics from the LaTeX sources
+
+Counts words, figures, tables, citations and acronym uses per chapter by
+streaming through caps/*.tex, plus defined acronyms (siglas/cap_siglas.tex)
+and bibliography entries (refs/referencias.bib). Results are cached per file
+hash in build/stats_cache.json, so only edited files are rescanned. The page
+count is read from the PDF page tree without decoding page contents.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import zlib
+
+# Get absolute path to project root (parent of scripts directory)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+CHAPTER_GLOB = 'caps/cap[0-9]*.tex'
+SIGLAS_FILE = 'siglas/cap_siglas.tex'
+BIB_FILE = 'refs/referencias.bib'
+PDF_FILE = 'main.pdf'
+CACHE_FILE = os.path.join('build', 'stats_cache.json')
+
+# Bumped whenever the counting rules change, to invalidate old cache entries
+CACHE_VERSION = 1
+
+COMMENT_RE = re.compile(r'(?<!\\)%.*')
+CHAPTER_RE = re.compile(r'\\chapter\*?\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+BEGIN_RE = re.compile(r'\\begin\{([^}]+)\}')
+CITE_RE = re.compile(r'\\(?:[Cc]ite[a-zA-Z]*)\*?(?:\s*\[[^\]]*\])*\s*\{([^}]*)\}')
+ACRONYM_USE_RE = re.compile(r'\\(?:[Gg]ls[a-z]*|GLS[A-Z]*|[Aa]cr(?:short|long|full)[a-z]*)\*?\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+NEWACRONYM_RE = re.compile(r'\\newacronym\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+BIB_ENTRY_RE = re.compile(r'^\s*@(\w+)\s*[{(]', re.MULTILINE)
+
+# Commands whose arguments never reach the reader
+NON_TEXT_COMMAND_RE = re.compile(
+    r'\\(?:label|ref|eqref|pageref|autoref|cite[a-zA-Z]*|Cite[a-zA-Z]*|includegraphics|input|include|'
+    r'begin|end|usepackage|addcontentsline|setlength|setcounter|vspace|hspace|definecolor|'
+    r'textcolor|color|bibliography|bibliographystyle|url|verb)\*?(?:\s*\[[^\]]*\])*(?:\s*\{[^}]*\})?'
+)
+INLINE_MATH_RE = re.compile(r'\$[^$]*\$')
+INLINE_VERB_RE = re.compile(r'\\verb(.).*?\1')
+COMMAND_RE = re.compile(r'\\[a-zA-Z@]+\*?|\\.')
+WORD_RE = re.compile(r'[^\W_]+(?:[-\'][^\W_]+)*')
+
+# Environments whose content is not counted as words
+SKIPPED_ENVIRONMENTS = {'verbatim', 'verbatim*', 'lstlisting', 'minted', 'tikzpicture',
+                        'equation', 'equation*', 'align', 'align*', 'comment'}
+FIGURE_ENVIRONMENTS = {'figure', 'figure*'}
+TABLE_ENVIRONMENTS = {'table', 'table*', 'longtable'}
+
+def file_hash(path):
+    """SHA-256 of a file, streamed"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def count_words(line):
+    """Words a reader would see on a source line"""
+    line = INLINE_VERB_RE.sub(' ', line)
+    line = INLINE_MATH_RE.sub(' ', line)
+    # Each acronym use renders as (at least) one word
+    line = ACRONYM_USE_RE.sub(' ACRONYM ', line)
+    line = NON_TEXT_COMMAND_RE.sub(' ', line)
+    line = COMMAND_RE.sub(' ', line)
+    return len(WORD_RE.findall(line))
+
+def scan_chapter(path):
+    """Stream one chapter and count its elements"""
+    stats = {
+        'title': '',
+        'words': 0,
+        'figures': 0,
+        'tables': 0,
+        'citations': 0,
+        'cited_keys': [],
+        'acronyms': 0,
+        'acronym_keys': [],
+    }
+    cited = set()
+    acronyms = set()
+    skip_depth = 0
+    skip_environment = None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if skip_environment is not None:
+                if rf'\end{{{skip_environment}}}' in line:
+                    skip_depth -= 1
+                    if skip_depth == 0:
+                        skip_environment = None
+                elif rf'\begin{{{skip_environment}}}' in line:
+                    skip_depth += 1
+                continue
+
+            line = COMMENT_RE.sub('', line)
+            if not line.strip():
+                continue
+
+            if not stats['title']:
+                match = CHAPTER_RE.search(line)
+                if match:
+                    stats['title'] = match.group(1).strip()
+
+            for environment in BEGIN_RE.findall(line):
+                if environment in FIGURE_ENVIRONMENTS:
+                    stats['figures'] += 1
+                elif environment in TABLE_ENVIRONMENTS:
+                    stats['tables'] += 1
+
+            for keys in CITE_RE.findall(line):
+                stats['citations'] += 1
+                cited.update(key.strip() for key in keys.split(',') if key.strip())
+
+            for key in ACRONYM_USE_RE.findall(line):
+                stats['acronyms'] += 1
+                acronyms.add(key.strip())
+
+            # Count the text before a skipped environment starts on this line
+            begin = next((m for m in BEGIN_RE.finditer(line) if m.group(1) in SKIPPED_ENVIRONMENTS), None)
+            if begin is not None:
+                stats['words'] += count_words(line[:begin.start()])
+                skip_environment = begin.group(1)
+                skip_depth = 1
+                rest = line[begin.end():]
+                if rf'\end{{{skip_environment}}}' in rest:
+                    skip_environment = None
+                    skip_depth = 0
+                continue
+
+            stats['words'] += count_words(line)
+
+    stats['cited_keys'] = sorted(cited)
+    stats['acronym_keys'] = sorted(acronyms)
+    return stats
+
+def scan_siglas(path):
+    """Acronyms defined in the siglas file"""
+    defined = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            defined.extend(NEWACRONYM_RE.findall(COMMENT_RE.sub('', line)))
+    return {'defined': sorted(defined)}
+
+def scan_bib(path):
+    """Bibliography entries (ignoring @string, @preamble and @comment)"""
+    entries = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = BIB_ENTRY_RE.match(line)
+            if match and match.group(1).lower() not in ('string', 'preamble', 'comment'):
+                entries += 1
+    return {'entries': entries}
+
+# ========================================
+# PDF page count
+# ========================================
+
+PAGES_TYPE_RE = re.compile(rb'/Type\s*/Pages\b')
+COUNT_RE = re.compile(rb'/Count\s+(\d+)')
+OBJSTM_RE = re.compile(rb'/Type\s*/ObjStm\b')
+STREAM_RE = re.compile(rb'stream\r?\n')
+
+def page_tree_count(data):
+    """Largest /Count among /Type /Pages nodes (the root of the page tree)"""
+    best = None
+    for match in PAGES_TYPE_RE.finditer(data):
+        start = data.rfind(b'<<', 0, match.start())
+        end = data.find(b'>>', match.end())
+        window = data[max(start, 0):end if end != -1 else len(data)]
+        for count in COUNT_RE.findall(window):
+            best = max(best or 0, int(count))
+    return best
+
+def pdf_page_count(path):
+    """Page count from the page tree; only object streams are inflated, never page content"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    count = page_tree_count(data)
+    if count is not None:
+        return count
+
+    # PDF 1.5+ may keep the page tree inside compressed object streams
+    for match in OBJSTM_RE.finditer(data):
+        stream = STREAM_RE.search(data, match.end())
+        if stream is None:
+            continue
+        end = data.find(b'endstream', stream.end())
+        try:
+            content = zlib.decompress(data[stream.end():end])
+        except zlib.error:
+            continue
+        found = page_tree_count(content)
+        if found is not None:
+            count = max(count or 0, found)
+    return count
+
+# ========================================
+# Cache and report
+# ========================================
+
+def load_cache(path):
+    """Per-file cache of scan results"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get('version') == CACHE_VERSION else {}
+
+def cached_scan(cache, relative_path, scanner):
+    """Return scan results, rescanning only if the file hash changed"""
+    path = os.path.join(PROJECT_ROOT, relative_path)
+    digest = file_hash(path)
+    files = cache.setdefault('files', {})
+    entry = files.get(relative_path)
+    if entry and entry['hash'] == digest:
+        return entry['stats'], False
+    stats = scanner(path)
+    files[relative_path] = {'hash': digest, 'stats': stats}
+    return stats, True
+
+def collect(use_cache=True):
+    """Gather statistics for every source file"""
+    cache_path = os.path.join(PROJECT_ROOT, CACHE_FILE)
+    cache = load_cache(cache_path) if use_cache else {}
+    cache['version'] = CACHE_VERSION
+    rescanned = []
+
+    chapters = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, CHAPTER_GLOB))):
+        relative_path = os.path.relpath(path, PROJECT_ROOT)
+        stats, scanned = cached_scan(cache, relative_path, scan_chapter)
+        chapters.append((relative_path, stats))
+        if scanned:
+            rescanned.append(relative_path)
+
+    siglas, scanned = cached_scan(cache, SIGLAS_FILE, scan_siglas)
+    if scanned:
+        rescanned.append(SIGLAS_FILE)
+    bib, scanned = cached_scan(cache, BIB_FILE, scan_bib)
+    if scanned:
+        rescanned.append(BIB_FILE)
+
+    # Drop entries of files that no longer exist
+    known = {path for path, _ in chapters} | {SIGLAS_FILE, BIB_FILE}
+    cache['files'] = {path: entry for path, entry in cache['files'].items() if path in known}
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+    pdf_path = os.path.join(PROJECT_ROOT, PDF_FILE)
+    pdf = None
+    if os.path.exists(pdf_path):
+        pdf = {'pages': pdf_page_count(pdf_path), 'bytes': os.path.getsize(pdf_path)}
+
+    return {
+        'chapters': chapters,
+        'acronyms_defined': siglas['defined'],
+        'bib_entries': bib['entries'],
+        'pdf': pdf,
+        'rescanned': rescanned,
+    }
+
+def format_size(size):
+    """Human readable file size"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
+
+def print_report(result):
+    """Print the statistics table"""
+    print("Document statistics:")
+    print(f"  {'Chapter':<12} {'Words':>7} {'Figures':>8} {'Tables':>7} {'Citations':>10} {'Acronyms':>9}  Title")
+
+    totals = {'words': 0, 'figures': 0, 'tables': 0, 'citations': 0, 'acronyms': 0}
+    cited = set()
+    used = set()
+    for path, stats in result['chapters']:
+        name = os.path.splitext(os.path.basename(path))[0]
+        print(f"  {name:<12} {stats['words']:>7} {stats['figures']:>8} {stats['tables']:>7} "
+              f"{stats['citations']:>10} {stats['acronyms']:>9}  {stats['title']}")
+        for key in totals:
+            totals[key] += stats[key]
+        cited.update(stats['cited_keys'])
+        used.update(stats['acronym_keys'])
+
+    print(f"  {'Total':<12} {totals['words']:>7} {totals['figures']:>8} {totals['tables']:>7} "
+          f"{totals['citations']:>10} {totals['acronyms']:>9}")
+    print("")
+    print(f"  References: {len(cited)} cited of {result['bib_entries']} in {BIB_FILE}")
+    print(f"  Acronyms:   {len(used)} used of {len(result['acronyms_defined'])} defined in {SIGLAS_FILE}")
+
+    pdf = result['pdf']
+    if pdf is None:
+        print(f"  Pages:      N/A ({PDF_FILE} not built)")
+    else:
+        pages = pdf['pages'] if pdf['pages'] is not None else 'N/A'
+        print(f"  Pages:      {pages}")
+        print(f"  File size:  {format_size(pdf['bytes'])}")
+
+    if result['rescanned']:
+        print(f"  (rescanned: {', '.join(result['rescanned'])})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Document statistics from the LaTeX sources")
+    parser.add_argument('--json', action='store_true', help="print the statistics as JSON")
+    parser.add_argument('--no-cache', action='store_true', help="rescan every file")
+    args = parser.parse_args()
+
+    result = collect(use_cache=not args.no_cache)
+
+    if args.json:
+        result['chapters'] = dict(result['chapters'])
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
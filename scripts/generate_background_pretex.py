@@ -6,32 +6,28 @@ generate_background_pretex.py - Generate pretextual background PNG with large ce
 import os
 import subprocess
 import sys
-import json
 
-def load_config():
-    """Load configuration from JSON file"""
-    # Get absolute path to project root (parent of scripts directory)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    config_path = os.path.join(project_root, 'includes', 'asset_config.json')
-    
-    if not os.path.exists(config_path):
-        print(f"❌ Configuration file not found: {config_path}")
-        sys.exit(1)
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from project_config import load_config
 
 def create_latex_file(footer_logo='images/drone_logo.png',
                       product_text='Produto 1',
                       meta_text='Meta 2 | Etapa 6: Tarifação',
-                      institution_logo='images/ita_traco.png'):
+                      institution_logo='images/ita_traco.png',
+                      main_color=None,
+                      tex_path='build/background_pretex_temp.tex'):
     """Create the temporary LaTeX file with embedded config for pretextual pages"""
     # Build the content line by line to avoid encoding issues
     lines = [
         r'\documentclass[12pt]{report}',
         r'\input{settings/usepackage.tex}',
         r'\input{settings/setcolor_generated.tex}',
+    ]
+    
+    # Optional override of the project color (used to render recolor references)
+    if main_color:
+        lines.append(rf'\definecolor{{projectMainColor}}{{HTML}}{{{main_color}}}')
+    
+    lines += [
         r'',
         r'% Embedded config from content_config_pretex.tex',
         rf'\def\pageProductText{{{product_text}}}',
@@ -131,18 +127,19 @@ def create_latex_file(footer_logo='images/drone_logo.png',
         r'\end{document}',
     ]
     
-    with open('build/background_pretex_temp.tex', 'w', encoding='utf-8', newline='\n') as f:
+    with open(tex_path, 'w', encoding='utf-8', newline='\n') as f:
         f.write('\n'.join(lines))
 
-def compile_pdf():
+def compile_pdf(tex_path='build/background_pretex_temp.tex'):
     """Compile the LaTeX file to PDF"""
-    cmd = ['xelatex', '-output-directory=build', '-interaction=nonstopmode', '-halt-on-error', 'build/background_pretex_temp.tex']
+    output_dir = os.path.dirname(tex_path)
+    cmd = ['xelatex', f'-output-directory={output_dir}', '-interaction=nonstopmode', '-halt-on-error', tex_path]
     result = subprocess.run(cmd, capture_output=True, text=True)
     return result.returncode == 0
 
-def convert_to_png():
+def convert_to_png(pdf_path='build/background_pretex_temp.pdf', png_path='capas/background_pretex.png'):
     """Convert PDF to PNG using ImageMagick"""
-    if not os.path.exists('build/background_pretex_temp.pdf'):
+    if not os.path.exists(pdf_path):
         print("❌ PDF file not found")
         return False
     
@@ -150,11 +147,13 @@ def convert_to_png():
     try:
         subprocess.run(['convert', '--version'], capture_output=True, check=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
-        print("⚠️  ImageMagick not found. PDF generated: build/background_pretex_temp.pdf")
+        print(f"⚠️  ImageMagick not found. PDF generated: {pdf_path}")
         print("   Install ImageMagick to convert to PNG: sudo apt-get install imagemagick")
         return False
     
-    cmd = ['convert', '-density', '300', 'build/background_pretex_temp.pdf', '-quality', '90', 'capas/background_pretex.png']
+    # -strip and exclude-chunks keep the PNG free of timestamps (reproducible output)
+    cmd = ['convert', '-density', '300', pdf_path, '-quality', '90',
+           '-strip', '-define', 'png:exclude-chunks=date,time', png_path]
     result = subprocess.run(cmd, capture_output=True, text=True)
     return result.returncode == 0
 
@@ -7,7 +7,8 @@ import os
 import subprocess
 import sys
 import re
-import json
+
+from project_config import load_config
 
 def parse_meta_text(meta_text):
     """Parse meta text to extract Meta number, Etapa number and title"""
@@ -32,20 +33,6 @@ def parse_product_text(product_text):
         return roman[num-1] if num <= 5 else str(num)
     return "I"
 
-def load_config():
-    """Load configuration from JSON file"""
-    # Get absolute path to project root (parent of scripts directory)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    config_path = os.path.join(project_root, 'includes', 'asset_config.json')
-    
-    if not os.path.exists(config_path):
-        print(f"❌ Configuration file not found: {config_path}")
-        sys.exit(1)
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
 def get_theme_colors(etapa_num, config):
     """Get theme colors from config"""
     return config["theme"]
@@ -188,7 +175,9 @@ def convert_to_png():
         print("   Install ImageMagick to convert to PNG: sudo apt-get install imagemagick")
         return False
     
-    cmd = ['convert', '-density', '300', 'build/cover_temp.pdf', '-quality', '90', 'capas/cover.png']
+    # -strip and exclude-chunks keep the PNG free of timestamps (reproducible output)
+    cmd = ['convert', '-density', '300', 'build/cover_temp.pdf', '-quality', '90',
+           '-strip', '-define', 'png:exclude-chunks=date,time', 'capas/cover.png']
     result = subprocess.run(cmd, capture_output=True, text=True)
     return result.returncode == 0
 
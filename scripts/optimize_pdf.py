@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+optimize_pdf.py - Post-process the final PDF for web publishing and e-mail
+
+Deduplicates identical image streams (backgrounds, logos), recompresses
+images above a size budget, drops unreferenced objects and linearizes the
+file for fast web view. Runs fully offline with pikepdf; if only the qpdf
+command is available, the file is just cleaned up and linearized.
+
+The /ID and dates are pinned to SOURCE_DATE_EPOCH here, since the object
+streams written by pikepdf hide the Info dictionary from reproducible.py.
+
+Reports the size before/after and the bytes (and estimated time) a viewer
+needs before it can display the first page.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from reproducible import fix_pdf, source_date_epoch
+
+# Images larger than this (encoded bytes) are candidates for recompression
+DEFAULT_MAX_IMAGE_BYTES = 1024 * 1024
+
+# Longest side, in pixels, kept for recompressed images (A4 at 150 dpi)
+DEFAULT_MAX_IMAGE_PIXELS = 1754
+
+DEFAULT_JPEG_QUALITY = 85
+
+# Bandwidth used to estimate time-to-first-page, in Mbit/s
+DEFAULT_BANDWIDTH = 10.0
+
+LINEARIZED_RE = re.compile(rb'/Linearized\s')
+FIRST_PAGE_END_RE = re.compile(rb'/E\s+(\d+)')
+
+def first_page_bytes(path):
+    """Bytes a viewer must download before showing page 1"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head = f.read(1024)
+    if not LINEARIZED_RE.search(head):
+        # Not linearized: the cross-reference table at the end is needed first
+        return size
+    dictionary = head[:head.find(b'>>') + 2]
+    match = FIRST_PAGE_END_RE.search(dictionary)
+    return int(match.group(1)) if match else size
+
+def format_size(size):
+    """Human readable file size"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
+
+def is_image(obj):
+    """True for image XObject streams"""
+    return isinstance(obj, pikepdf.Stream) and obj.get('/Subtype') == pikepdf.Name.Image
+
+def image_key(obj):
+    """Hash of an image stream: raw data plus every dictionary entry except /Length"""
+    digest = hashlib.sha256(obj.read_raw_bytes())
+    for key in sorted(obj.keys()):
+        if key != '/Length':
+            digest.update(f'{key}={obj[key]!r}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+def replace_images(resources, canonical, seen):
+    """Point XObject references at canonical image streams, recursing into forms"""
+    if resources is None:
+        return 0
+    # Shared (indirect) dictionaries are visited once; direct ones cannot be shared
+    if resources.is_indirect:
+        if resources.objgen in seen:
+            return 0
+        seen.add(resources.objgen)
+
+    replaced = 0
+    xobjects = resources.get('/XObject')
+    if xobjects is None:
+        return 0
+    for name in list(xobjects.keys()):
+        xobject = xobjects[name]
+        if is_image(xobject):
+            target = canonical.get(xobject.objgen)
+            if target is not None and target.objgen != xobject.objgen:
+                xobjects[name] = target
+                replaced += 1
+        elif isinstance(xobject, pikepdf.Stream) and xobject.get('/Subtype') == pikepdf.Name.Form:
+            replaced += replace_images(xobject.get('/Resources'), canonical, seen)
+    return replaced
+
+def page_resources(page):
+    """Resources of a page, inherited from the page tree when the page has none"""
+    node = page.obj
+    while node is not None:
+        if '/Resources' in node:
+            return node.Resources
+        node = node.get('/Parent')
+    return None
+
+def deduplicate_images(pdf):
+    """Merge identical image streams; returns (references rewritten, unique images)"""
+    first_by_key = {}
+    canonical = {}
+    for obj in pdf.objects:
+        if is_image(obj):
+            key = image_key(obj)
+            canonical[obj.objgen] = first_by_key.setdefault(key, obj)
+
+    seen = set()
+    replaced = 0
+    for page in pdf.pages:
+        replaced += replace_images(page_resources(page), canonical, seen)
+    return replaced, list(first_by_key.values())
+
+def recompress_image(obj, max_bytes, max_pixels, quality):
+    """Downscale and JPEG-encode an oversized image; returns bytes saved"""
+    original = len(obj.read_raw_bytes())
+    if original <= max_bytes or '/SMask' in obj or '/Mask' in obj or '/ImageMask' in obj:
+        return 0
+
+    try:
+        image = pikepdf.PdfImage(obj).as_pil_image()
+    except (pikepdf.PdfError, NotImplementedError, ValueError):
+        return 0
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    scale = max_pixels / max(image.size)
+    if scale < 1:
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    data = buffer.getvalue()
+    if len(data) >= original:
+        return 0
+
+    obj.write(data, filter=pikepdf.Name.DCTDecode)
+    obj.Width = image.width
+    obj.Height = image.height
+    obj.BitsPerComponent = 8
+    obj.ColorSpace = pikepdf.Name.DeviceRGB if image.mode == 'RGB' else pikepdf.Name.DeviceGray
+    for key in ('/DecodeParms', '/Decode'):
+        if key in obj:
+            del obj[key]
+    return original - len(data)
+
+def optimize_with_pikepdf(input_path, output_path, args):
+    """Full pipeline: dedup, recompress, prune, linearize"""
+    with pikepdf.open(input_path) as pdf:
+        replaced, images = deduplicate_images(pdf)
+        print(f"  🔗 Deduplicated image references: {replaced}")
+
+        if Image is None:
+            print("  ⚠️  Pillow not found, skipping image recompression (pip install pillow)")
+        else:
+            saved = 0
+            recompressed = 0
+            for obj in images:
+                gain = recompress_image(obj, args.max_image_bytes, args.max_image_pixels, args.jpeg_quality)
+                if gain:
+                    saved += gain
+                    recompressed += 1
+            print(f"  🗜️  Recompressed images: {recompressed} ({format_size(saved)} saved)")
+
+        # Object streams compress the Info dictionary, where reproducible.py
+        # can no longer patch the dates: pin them before saving
+        epoch = source_date_epoch()
+        if epoch is not None:
+            stamp = time.strftime("D:%Y%m%d%H%M%S+00'00'", time.gmtime(epoch))
+            pdf.docinfo[pikepdf.Name.CreationDate] = stamp
+            pdf.docinfo[pikepdf.Name.ModDate] = stamp
+
+        pdf.remove_unreferenced_resources()
+        pdf.save(output_path,
+                 linearize=True,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                 compress_streams=True,
+                 deterministic_id=True)
+
+def optimize_with_qpdf(input_path, output_path):
+    """Fallback: qpdf drops unreferenced objects and linearizes"""
+    # Object streams are preserved so the dates stay patchable by fix_pdf()
+    cmd = ['qpdf', '--linearize', '--object-streams=preserve', '--deterministic-id',
+           input_path, output_path]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    # qpdf exits with 3 for warnings; the output is still written
+    return result.returncode in (0, 3)
+
+def copy_unoptimized(input_path, output_path, temp_path, reason):
+    """Post-processing is optional: fall back to the unoptimized PDF"""
+    print(f"⚠️  {reason}; copying unoptimized PDF")
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    if not (os.path.exists(output_path) and os.path.samefile(input_path, output_path)):
+        shutil.copyfile(input_path, output_path)
+    fix_pdf(output_path)
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize the final PDF for web view")
+    parser.add_argument('input', help="PDF to optimize (e.g. build/main.pdf)")
+    parser.add_argument('output', help="optimized PDF (e.g. main.pdf)")
+    parser.add_argument('--max-image-bytes', type=int, default=DEFAULT_MAX_IMAGE_BYTES,
+                        help="recompress images larger than this many bytes (default: 1 MiB)")
+    parser.add_argument('--max-image-pixels', type=int, default=DEFAULT_MAX_IMAGE_PIXELS,
+                        help="longest side of recompressed images (default: 1754, A4 at 150 dpi)")
+    parser.add_argument('--jpeg-quality', type=int, default=DEFAULT_JPEG_QUALITY,
+                        help="JPEG quality for recompressed images (default: 85)")
+    parser.add_argument('--bandwidth', type=float, default=DEFAULT_BANDWIDTH,
+                        help="Mbit/s used to estimate time-to-first-page (default: 10)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ PDF file not found: {args.input}")
+        return 1
+
+    print(f"📦 Optimizing {args.input} -> {args.output}")
+    before_size = os.path.getsize(args.input)
+    before_first = first_page_bytes(args.input)
+    start = time.perf_counter()
+
+    # Write next to the output and move into place, so input and output may be the same file
+    temp_path = args.output + '.tmp'
+    if pikepdf is not None:
+        try:
+            optimize_with_pikepdf(args.input, temp_path, args)
+        except (pikepdf.PdfError, OSError, ValueError) as e:
+            return copy_unoptimized(args.input, args.output, temp_path, f"pikepdf failed: {e}")
+    elif shutil.which('qpdf'):
+        print("  ⚠️  pikepdf not found, using qpdf (no image dedup/recompression): pip install pikepdf")
+        if not optimize_with_qpdf(args.input, temp_path):
+            return copy_unoptimized(args.input, args.output, temp_path, "qpdf failed")
+        fix_pdf(temp_path)
+    else:
+        return copy_unoptimized(args.input, args.output, temp_path,
+                                "neither pikepdf nor qpdf found (pip install pikepdf)")
+    os.replace(temp_path, args.output)
+
+    after_size = os.path.getsize(args.output)
+    after_first = first_page_bytes(args.output)
+    bytes_per_second = args.bandwidth * 1e6 / 8
+
+    print(f"  Size:          {format_size(before_size)} -> {format_size(after_size)} "
+          f"({100 * (after_size - before_size) / before_size:+.1f}%)")
+    print(f"  First page:    {format_size(before_first)} -> {format_size(after_first)} needed "
+          f"(~{before_first / bytes_per_second:.2f}s -> ~{after_first / bytes_per_second:.2f}s "
+          f"at {args.bandwidth:g} Mbit/s)")
+    print(f"✅ Optimized in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+prepare_fonts.py - Validate and index the Cheltenham faces the project uses
+
+Subcommands:
+    check     Validate the faces referenced by the sources (OpenType table
+              directory, outlines, names); exits 1 if a face is missing or
+              broken. build/font_index.json only records checked faces so
+              unchanged ones are not re-read; xelatex loads the faces by
+              Path= and no font cache is produced
+    measure   Time the main.tex preamble with and without settings/fonts.tex
+              and report the font-loading share of the recorded xelatex steps
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import time
+
+import build_timings
+
+# Get absolute path to project root (parent of scripts directory)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+FONTS_DIR = 'fonts'
+FONT_PREFIX = 'CheltenhamITCPro'
+INDEX_FILE = os.path.join('build', 'font_index.json')
+
+# Font-loading measurement: kept out of the build step history
+MEASURE_DIR = os.path.join('build', 'font_measure')
+MEASURE_FILE = os.path.join('build', 'font_timing.json')
+MAIN_TEX = 'main.tex'
+FONTS_INPUT_RE = re.compile(r'^\s*\\input\{settings/fonts(?:\.tex)?\}.*$', re.MULTILINE)
+
+# Files whose font declarations define the faces in use
+SOURCE_GLOBS = ['main.tex', 'settings/*.tex', 'scripts/generate_*.py']
+FACE_RE = re.compile(re.escape(FONT_PREFIX) + r'-[A-Za-z]+')
+
+SFNT_VERSIONS = {b'OTTO', b'\x00\x01\x00\x00', b'true'}
+REQUIRED_TABLES = {b'cmap', b'head', b'hhea', b'hmtx', b'maxp', b'name', b'OS/2', b'post'}
+OUTLINE_TABLES = {b'CFF ', b'CFF2', b'glyf'}
+
+# name table IDs stored in the index
+NAME_IDS = {1: 'family', 2: 'subfamily', 4: 'full_name'}
+
+def used_faces():
+    """Faces referenced by the project sources, sorted"""
+    faces = set()
+    for pattern in SOURCE_GLOBS:
+        for path in glob.glob(os.path.join(PROJECT_ROOT, pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                faces.update(FACE_RE.findall(f.read()))
+    return sorted(faces)
+
+def read_names(data, offset):
+    """Family/subfamily/full name from an OpenType name table"""
+    names = {}
+    _, count, string_offset = struct.unpack('>HHH', data[offset:offset + 6])
+    for i in range(count):
+        record = offset + 6 + 12 * i
+        platform, encoding, _, name_id, length, start = struct.unpack('>HHHHHH', data[record:record + 12])
+        if name_id not in NAME_IDS or NAME_IDS[name_id] in names:
+            continue
+        raw = data[offset + string_offset + start:offset + string_offset + start + length]
+        if platform == 3 or platform == 0:
+            names[NAME_IDS[name_id]] = raw.decode('utf-16-be', errors='replace')
+        elif platform == 1 and encoding == 0:
+            names[NAME_IDS[name_id]] = raw.decode('mac_roman', errors='replace')
+    return names
+
+def validate_face(path):
+    """Check the sfnt structure of a font file; returns (info, errors)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    errors = []
+    if len(data) < 12 or data[:4] not in SFNT_VERSIONS:
+        return None, ['not an OpenType/TrueType file']
+
+    num_tables = struct.unpack('>H', data[4:6])[0]
+    tables = {}
+    for i in range(num_tables):
+        record = 12 + 16 * i
+        if record + 16 > len(data):
+            return None, ['truncated table directory']
+        tag, _, offset, length = struct.unpack('>4sIII', data[record:record + 16])
+        if offset + length > len(data):
+            errors.append(f"table {tag.decode('latin-1')!r} extends past end of file")
+        tables[tag] = offset
+
+    missing = REQUIRED_TABLES - set(tables)
+    if missing:
+        errors.append('missing tables: ' + ', '.join(sorted(t.decode('latin-1') for t in missing)))
+    if not OUTLINE_TABLES & set(tables):
+        errors.append('no glyph outlines (CFF/glyf)')
+
+    info = {
+        'file': os.path.relpath(path, PROJECT_ROOT),
+        'bytes': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'tables': num_tables,
+    }
+    if b'name' in tables and not errors:
+        info.update(read_names(data, tables[b'name']))
+    return info, errors
+
+def load_index():
+    """Previous index, or an empty one"""
+    try:
+        with open(os.path.join(PROJECT_ROOT, INDEX_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'faces': {}}
+
+def is_current(info, path):
+    """True if an indexed face still matches the file on disk"""
+    stat = os.stat(path)
+    return info.get('bytes') == stat.st_size and info.get('mtime_ns') == stat.st_mtime_ns
+
+def cmd_check(args):
+    """Validate and index the used faces; unchanged faces are not re-read"""
+    faces = used_faces()
+    available = sorted(os.path.splitext(os.path.basename(path))[0]
+                       for path in glob.glob(os.path.join(PROJECT_ROOT, FONTS_DIR, f'{FONT_PREFIX}-*.otf')))
+
+    previous = load_index()['faces']
+    index = {'faces': {}, 'unused': [face for face in available if face not in faces]}
+    failed = False
+    checked = 0
+    for face in faces:
+        path = os.path.join(PROJECT_ROOT, FONTS_DIR, f'{face}.otf')
+        if not os.path.exists(path):
+            print(f"❌ {face}: {os.path.relpath(path, PROJECT_ROOT)} not found")
+            failed = True
+            continue
+        if face in previous and is_current(previous[face], path):
+            index['faces'][face] = previous[face]
+            continue
+        info, errors = validate_face(path)
+        if errors:
+            print(f"❌ {face}: {'; '.join(errors)}")
+            failed = True
+            continue
+        info['mtime_ns'] = os.stat(path).st_mtime_ns
+        index['faces'][face] = info
+        checked += 1
+    if failed:
+        return 1
+
+    os.makedirs(os.path.join(PROJECT_ROOT, os.path.dirname(INDEX_FILE)), exist_ok=True)
+    with open(os.path.join(PROJECT_ROOT, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+    if checked:
+        print(f"✅ {len(faces)} font faces valid ({checked} checked, {len(index['unused'])} unused skipped)")
+    return 0
+
+# ========================================
+# Font-loading measurement
+# ========================================
+
+def measure_document(with_fonts):
+    """The main.tex preamble and an empty body, optionally without settings/fonts.tex"""
+    with open(os.path.join(PROJECT_ROOT, MAIN_TEX), 'r', encoding='utf-8') as f:
+        preamble = f.read().partition(r'\begin{document}')[0]
+    if not with_fonts:
+        preamble = FONTS_INPUT_RE.sub('', preamble)
+    return preamble.rstrip() + '\n\\begin{document}\nx\n\\end{document}\n'
+
+def time_preamble(with_fonts, runs):
+    """Median wall time of compiling the preamble document from the project root"""
+    name = 'with_fonts' if with_fonts else 'without_fonts'
+    tex_path = os.path.join(MEASURE_DIR, f'{name}.tex')
+    with open(os.path.join(PROJECT_ROOT, tex_path), 'w', encoding='utf-8', newline='\n') as f:
+        f.write(measure_document(with_fonts))
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(['xelatex', f'-output-directory={MEASURE_DIR}', '-interaction=nonstopmode',
+                                 '-halt-on-error', tex_path],
+                                cwd=PROJECT_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"❌ Compilation failed! Check {MEASURE_DIR}/{name}.log for details")
+            return None
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def cmd_measure(args):
+    """Report the font-loading share of the recorded xelatex steps"""
+    if shutil.which('xelatex') is None:
+        print("❌ xelatex not found")
+        return 1
+    with open(os.path.join(PROJECT_ROOT, MAIN_TEX), 'r', encoding='utf-8') as f:
+        if not FONTS_INPUT_RE.search(f.read()):
+            print(f"❌ {MAIN_TEX} does not input settings/fonts.tex")
+            return 1
+
+    os.makedirs(os.path.join(PROJECT_ROOT, MEASURE_DIR), exist_ok=True)
+    print(f"⏱️  Timing the {MAIN_TEX} preamble with and without settings/fonts.tex ({args.runs} runs each)...")
+    without_fonts = time_preamble(False, args.runs)
+    with_fonts = time_preamble(True, args.runs)
+    if without_fonts is None or with_fonts is None:
+        return 1
+
+    font_cost = max(with_fonts - without_fonts, 0.0)
+    with open(os.path.join(PROJECT_ROOT, MEASURE_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'measured': time.time(),
+            'runs': args.runs,
+            'without_fonts': without_fonts,
+            'with_fonts': with_fonts,
+            'font_load': font_cost,
+        }, f, indent=2)
+
+    print(f"  Preamble without fonts: {without_fonts:.2f}s")
+    print(f"  Preamble with fonts:    {with_fonts:.2f}s")
+    print(f"  Font loading per pass:  {font_cost:.2f}s")
+
+    # Every xelatex pass of main.tex (and each chapter preview) loads the same faces
+    db_path = os.environ.get('BUILD_TIMINGS_DB', build_timings.DEFAULT_DB)
+    conn = build_timings.connect(db_path)
+    steps = [row[0] for row in conn.execute(
+        "SELECT DISTINCT step FROM runs WHERE step LIKE 'xelatex-%' OR step LIKE 'preview-%' ORDER BY step")]
+    shown = [(step, build_timings.predict(conn, step)) for step in steps]
+    shown = [(step, predicted) for step, predicted in shown if predicted]
+    conn.close()
+
+    if not shown:
+        print("  ⚠️  No xelatex timings recorded yet; run 'make' once to see the per-step share")
+        return 0
+    print("")
+    print(f"  {'Step':<28} {'Median':>8} {'Fonts':>7}")
+    for step, predicted in shown:
+        print(f"  {step:<28} {predicted:>7.1f}s {100 * min(font_cost / predicted, 1.0):>6.0f}%")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and measure project fonts")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser('check', help="validate and index the used faces")
+    check_parser.set_defaults(func=cmd_check)
+
+    measure_parser = subparsers.add_parser('measure', help="measure the font-loading share of compiles")
+    measure_parser.add_argument('--runs', type=int, default=3, help="compilations of each preamble variant (default: 3)")
+    measure_parser.set_defaults(func=cmd_measure)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
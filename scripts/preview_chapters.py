@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+preview_chapters.py - Compile only the edited chapters into per-chapter preview PDFs
+
+Each chapter is wrapped in a small document that reuses the preamble of
+main.tex (same packages, colors, fonts and background). The .aux of the last
+full build is copied next to each wrapper, so references, citations and
+acronyms pointing to other chapters still resolve in a single xelatex pass.
+Chapters compile in parallel; PDFs are written to build/preview/capNN.pdf.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import build_timings
+
+# Get absolute path to project root (parent of scripts directory)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+MAIN_TEX = 'main.tex'
+MAIN_AUX = os.path.join('build', 'main.aux')
+PREVIEW_DIR = os.path.join('build', 'preview')
+STATE_FILE = os.path.join(PREVIEW_DIR, 'state.json')
+
+CHAPTER_INPUT_RE = re.compile(r'^[^%\n]*\\input\{(caps/cap\d+)(?:\.tex)?\}', re.MULTILINE)
+NUMBERED_CHAPTER_RE = re.compile(r'^\s*\\chapter\s*[\[{]', re.MULTILINE)
+
+def read_text(path):
+    """Read a project file as UTF-8"""
+    with open(os.path.join(PROJECT_ROOT, path), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def file_hash(path):
+    """SHA-256 of a project file"""
+    with open(os.path.join(PROJECT_ROOT, path), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def parse_main():
+    """Return (preamble, ordered chapter names) from main.tex"""
+    source = read_text(MAIN_TEX)
+    preamble, separator, body = source.partition(r'\begin{document}')
+    if not separator:
+        print(f"❌ No \\begin{{document}} found in {MAIN_TEX}")
+        sys.exit(1)
+    chapters = [os.path.basename(path) for path in CHAPTER_INPUT_RE.findall(body)]
+    return preamble, chapters
+
+def chapter_offset(chapters, chapter):
+    """Number of numbered chapters before this one in main.tex order"""
+    offset = 0
+    for name in chapters[:chapters.index(chapter)]:
+        offset += len(NUMBERED_CHAPTER_RE.findall(read_text(f'caps/{name}.tex')))
+    return offset
+
+def load_state():
+    """Chapter hashes of the last successful preview"""
+    path = os.path.join(PROJECT_ROOT, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state):
+    """Persist chapter hashes"""
+    with open(os.path.join(PROJECT_ROOT, STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def changed_chapters(chapters, state):
+    """Chapters edited since their last preview (or since the last full build)"""
+    aux_path = os.path.join(PROJECT_ROOT, MAIN_AUX)
+    aux_mtime = os.path.getmtime(aux_path) if os.path.exists(aux_path) else 0.0
+
+    changed = []
+    for chapter in chapters:
+        source = f'caps/{chapter}.tex'
+        if chapter in state:
+            if state[chapter] != file_hash(source):
+                changed.append(chapter)
+        elif os.path.getmtime(os.path.join(PROJECT_ROOT, source)) > aux_mtime:
+            changed.append(chapter)
+    return changed
+
+def write_wrapper(preamble, chapter, offset):
+    """Write the single-chapter document for a chapter"""
+    lines = [
+        preamble.rstrip(),
+        '',
+        r'\begin{document}',
+        r'\pagenumbering{arabic}',
+        r'\pagestyle{plain}',
+        rf'\setcounter{{chapter}}{{{offset}}}',
+        rf'\input{{caps/{chapter}.tex}}',
+        r'\end{document}',
+    ]
+    tex_path = os.path.join(PREVIEW_DIR, f'{chapter}.tex')
+    with open(os.path.join(PROJECT_ROOT, tex_path), 'w', encoding='utf-8', newline='\n') as f:
+        f.write('\n'.join(lines) + '\n')
+    return tex_path
+
+def compile_chapter(chapter, tex_path):
+    """Compile one chapter wrapper; returns (chapter, success, seconds)"""
+    aux_source = os.path.join(PROJECT_ROOT, MAIN_AUX)
+    if os.path.exists(aux_source):
+        shutil.copyfile(aux_source, os.path.join(PROJECT_ROOT, PREVIEW_DIR, f'{chapter}.aux'))
+
+    cmd = ['xelatex', f'-output-directory={PREVIEW_DIR}', '-interaction=nonstopmode',
+           '-halt-on-error', tex_path]
+    started = time.time()
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+        returncode = result.returncode
+    except FileNotFoundError:
+        returncode = 127
+    elapsed = time.perf_counter() - start
+
+    db_path = os.environ.get('BUILD_TIMINGS_DB', build_timings.DEFAULT_DB)
+    build_timings.record(db_path, f'preview-{chapter}', started, elapsed, returncode)
+    return chapter, returncode == 0, elapsed
+
+def normalize(name):
+    """Accept 'cap07', 'cap07.tex' or 'caps/cap07.tex'"""
+    return os.path.splitext(os.path.basename(name))[0]
+
+def preview(names, jobs):
+    """Compile the given chapters in parallel and report"""
+    preamble, chapters = parse_main()
+    wrappers = {chapter: write_wrapper(preamble, chapter, chapter_offset(chapters, chapter))
+                for chapter in names}
+
+    print(f"👀 Previewing {len(names)} chapter(s): {', '.join(names)}")
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(lambda chapter: compile_chapter(chapter, wrappers[chapter]), names))
+
+    state = load_state()
+    failed = 0
+    for chapter, success, elapsed in results:
+        if success:
+            state[chapter] = file_hash(f'caps/{chapter}.tex')
+            print(f"  ✅ {PREVIEW_DIR}/{chapter}.pdf ({elapsed:.1f}s)")
+        else:
+            failed += 1
+            print(f"  ❌ {chapter} failed! Check {PREVIEW_DIR}/{chapter}.log for details")
+    save_state(state)
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-chapter incremental preview builds")
+    parser.add_argument('chapters', nargs='*',
+                        help="chapters to preview (e.g. cap07); default: chapters edited since last preview")
+    parser.add_argument('--all', action='store_true', help="preview every chapter")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="parallel xelatex processes (default: CPU count)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and preview chapters as they are saved")
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help="polling interval for --watch, in seconds (default: 0.5)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(PROJECT_ROOT, PREVIEW_DIR), exist_ok=True)
+    _, chapters = parse_main()
+
+    if not os.path.exists(os.path.join(PROJECT_ROOT, MAIN_AUX)):
+        print(f"⚠️  {MAIN_AUX} not found: references to other chapters will show '??'. Run 'make' once.")
+
+    if args.chapters:
+        names = [normalize(name) for name in args.chapters]
+        unknown = [name for name in names if name not in chapters]
+        if unknown:
+            print(f"❌ Not a chapter of {MAIN_TEX}: {', '.join(unknown)}")
+            return 1
+        return preview(names, args.jobs)
+
+    if args.all:
+        return preview(chapters, args.jobs)
+
+    if not args.watch:
+        names = changed_chapters(chapters, load_state())
+        if not names:
+            print("✅ No chapter changed since the last preview")
+            return 0
+        return preview(names, args.jobs)
+
+    print("Watching caps/*.tex for changes... (Press Ctrl+C to stop)")
+    # Hashes already attempted, so a failing chapter waits for its next save
+    attempted = {}
+    try:
+        while True:
+            names = [chapter for chapter in changed_chapters(chapters, load_state())
+                     if attempted.get(chapter) != file_hash(f'caps/{chapter}.tex')]
+            if names:
+                attempted.update({chapter: file_hash(f'caps/{chapter}.tex') for chapter in names})
+                preview(names, args.jobs)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
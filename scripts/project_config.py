@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+project_config.py - Load and validate includes/asset_config.json
+
+Shared by every script that reads the asset configuration. The file is
+parsed and checked once per process (required keys and types, referenced
+images, palette hex values, project meta/etapa present in the palette);
+the normalized result is cached in build/config_cache.json keyed by the
+file's mtime/size and SHA-256, so later processes skip parsing and schema
+checks entirely.
+
+Usage:
+    python3 scripts/project_config.py check          # validate, exit 1 on errors
+    python3 scripts/project_config.py get project.meta
+    python3 scripts/project_config.py shell [META ETAPA]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+# Get absolute path to project root (parent of scripts directory)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+CONFIG_PATH = os.path.join(PROJECT_ROOT, 'includes', 'asset_config.json')
+CACHE_PATH = os.path.join(PROJECT_ROOT, 'build', 'config_cache.json')
+
+# Bump when the schema or normalization changes, to invalidate cached results
+CACHE_VERSION = 1
+
+HEX_RE = re.compile(r'^#?([0-9a-fA-F]{6})$')
+
+# Keys the scripts read: nested dicts, or the expected type of the value
+SCHEMA = {
+    'project': {
+        'title': str,
+        'meta': int,
+        'etapa': int,
+        'meta_text': str,
+        'product_text': str,
+        'month': str,
+        'year': str,
+    },
+    'assets': {
+        'images': {
+            'institution_logo': str,
+            'project_logo': str,
+            'background_logo': str,
+            'ita_traco_logo': str,
+        },
+    },
+    'theme': {
+        'bg_color': str,
+        'header_text': str,
+        'footer_text': str,
+    },
+    'colors': {
+        'project_main': str,
+        'coordination': str,
+        'institution': str,
+        'accent': str,
+        'palette': dict,
+    },
+}
+
+# Color specs that may be "auto" (resolved from the palette) instead of hex
+AUTO_COLORS = ('project_main', 'coordination', 'accent')
+
+# Parsed config per process, keyed by (path, mtime_ns, size)
+_loaded = {}
+
+def check_schema(config, schema, prefix, errors):
+    """Check required keys and value types against SCHEMA"""
+    for key, expected in schema.items():
+        name = f'{prefix}{key}'
+        if key not in config:
+            errors.append(f'missing key: {name}')
+        elif isinstance(expected, dict):
+            if isinstance(config[key], dict):
+                check_schema(config[key], expected, f'{name}.', errors)
+            else:
+                errors.append(f'{name} must be a dict, got {type(config[key]).__name__}')
+        elif expected is int:
+            # meta/etapa are numbers, but "2" is accepted as well
+            if as_int(config[key]) is None:
+                errors.append(f'{name} must be an integer, got {config[key]!r}')
+        elif not isinstance(config[key], expected):
+            errors.append(f'{name} must be a {expected.__name__}, got {type(config[key]).__name__}')
+
+def normalize_hex(value):
+    """'#2F84C6' -> '2f84c6'; None if not a 6-digit hex color"""
+    match = HEX_RE.match(value) if isinstance(value, str) else None
+    return match.group(1).lower() if match else None
+
+def section(config, *keys):
+    """Nested dict at keys, or {} when missing or not a dict (already reported by the schema check)"""
+    for key in keys:
+        config = config.get(key) if isinstance(config, dict) else None
+    return config if isinstance(config, dict) else {}
+
+def as_int(value):
+    """int(value) for integers and integer strings, else None"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+def validate(config):
+    """Check a parsed config; returns (normalized config, list of every error found)"""
+    errors = []
+    if not isinstance(config, dict):
+        return None, ['top level must be a JSON object']
+    check_schema(config, SCHEMA, '', errors)
+
+    # The remaining checks run on whatever parts are present, so one run lists everything
+    project = section(config, 'project')
+    for key in ('meta', 'etapa'):
+        if as_int(project.get(key)) is not None:
+            project[key] = as_int(project[key])
+
+    colors = section(config, 'colors')
+    for key in ('institution',) + AUTO_COLORS:
+        if key not in colors or (key in AUTO_COLORS and colors[key] == 'auto'):
+            continue
+        value = normalize_hex(colors[key])
+        if value is None:
+            errors.append(f'colors.{key} must be "auto" or a hex color, got {colors[key]!r}')
+        else:
+            colors[key] = value
+
+    palette = section(config, 'colors', 'palette')
+    for meta_key, meta_colors in palette.items():
+        if not isinstance(meta_colors, dict):
+            errors.append(f'colors.palette.{meta_key} must be a dict')
+            continue
+        for etapa_key, color_hex in meta_colors.items():
+            value = normalize_hex(color_hex)
+            if value is None:
+                errors.append(f'colors.palette.{meta_key}.{etapa_key}: invalid hex color {color_hex!r}')
+            else:
+                meta_colors[etapa_key] = value
+
+    meta, etapa = project.get('meta'), project.get('etapa')
+    if isinstance(meta, int) and palette:
+        meta_key = f'meta{meta}'
+        if meta_key not in palette:
+            errors.append(f'project.meta {meta}: no colors.palette.{meta_key}')
+        elif isinstance(etapa, int) and isinstance(palette[meta_key], dict) \
+                and f'etapa{etapa}' not in palette[meta_key]:
+            errors.append(f'project.etapa {etapa}: no colors.palette.{meta_key}.etapa{etapa}')
+
+    errors.extend(check_images(config))
+    return (None, errors) if errors else (config, [])
+
+def check_images(config):
+    """Referenced image files that do not exist"""
+    errors = []
+    for key, path in section(config, 'assets', 'images').items():
+        if isinstance(path, str) and not os.path.isfile(os.path.join(PROJECT_ROOT, path)):
+            errors.append(f'assets.images.{key}: file not found: {path}')
+    return errors
+
+def file_hash(path):
+    """SHA-256 of a file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def read_cache(stat, read_hash):
+    """Cached normalized config if it matches the file, else None"""
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get('version') != CACHE_VERSION or cache.get('path') != CONFIG_PATH:
+        return None
+    if cache.get('mtime_ns') == stat.st_mtime_ns and cache.get('size') == stat.st_size:
+        return cache['config']
+    # Touched but possibly unchanged (checkout, copy): compare content
+    if cache.get('sha256') == read_hash():
+        write_cache(stat, cache['sha256'], cache['config'])
+        return cache['config']
+    return None
+
+def write_cache(stat, digest, config):
+    """Store the normalized config; concurrent writers each use their own temp file"""
+    cache = {
+        'version': CACHE_VERSION,
+        'path': CONFIG_PATH,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+        'config': config,
+    }
+    temp_path = f'{CACHE_PATH}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(temp_path, CACHE_PATH)
+    except OSError:
+        # The cache is an optimization only
+        pass
+
+def fail(errors):
+    """Print configuration errors and exit (stderr, so shell callers capturing stdout still show them)"""
+    print(f"❌ Invalid configuration: {os.path.relpath(CONFIG_PATH, PROJECT_ROOT)}", file=sys.stderr)
+    for error in errors:
+        print(f"   - {error}", file=sys.stderr)
+    sys.exit(1)
+
+def load_config():
+    """Load, validate and normalize asset_config.json (exits on errors)"""
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except OSError:
+        print(f"❌ Configuration file not found: {CONFIG_PATH}", file=sys.stderr)
+        sys.exit(1)
+
+    key = (CONFIG_PATH, stat.st_mtime_ns, stat.st_size)
+    if key in _loaded:
+        return _loaded[key]
+
+    config = read_cache(stat, lambda: file_hash(CONFIG_PATH))
+    if config is not None:
+        # Images may have moved since the result was cached
+        errors = check_images(config)
+        if errors:
+            fail(errors)
+    else:
+        with open(CONFIG_PATH, 'rb') as f:
+            data = f.read()
+        try:
+            config = json.loads(data.decode('utf-8'))
+        except ValueError as e:
+            fail([f'not valid JSON: {e}'])
+        config, errors = validate(config)
+        if errors:
+            fail(errors)
+        write_cache(stat, hashlib.sha256(data).hexdigest(), config)
+
+    _loaded.clear()
+    _loaded[key] = config
+    return config
+
+def lookup(config, dotted):
+    """Value at a dotted key path, e.g. 'project.meta'"""
+    value = config
+    for part in dotted.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            print(f"❌ No such configuration key: {dotted}", file=sys.stderr)
+            sys.exit(1)
+        value = value[part]
+    return value
+
+def cmd_check(args):
+    """Validate the configuration"""
+    start = time.perf_counter()
+    config = load_config()
+    project = config['project']
+    print(f"✅ Configuration valid: Meta {project['meta']} Etapa {project['etapa']} "
+          f"({1000 * (time.perf_counter() - start):.0f}ms)")
+    return 0
+
+def cmd_get(args):
+    """Print one value (JSON for dicts and lists)"""
+    value = lookup(load_config(), args.key)
+    print(json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value)
+    return 0
+
+def cmd_shell(args):
+    """Print PROJECT_META/PROJECT_ETAPA/PROJECT_COLOR assignments for shell scripts"""
+    config = load_config()
+    meta = args.meta if args.meta is not None else config['project']['meta']
+    etapa = args.etapa if args.etapa is not None else config['project']['etapa']
+    color = config['colors']['palette'].get(f'meta{meta}', {}).get(f'etapa{etapa}')
+    if color is None:
+        print(f"❌ Invalid Meta ({meta}) or Etapa ({etapa})", file=sys.stderr)
+        return 1
+    print(f'PROJECT_META={meta}')
+    print(f'PROJECT_ETAPA={etapa}')
+    print(f'PROJECT_COLOR={color}')
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and query includes/asset_config.json")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser('check', help="validate the configuration")
+    check_parser.set_defaults(func=cmd_check)
+
+    get_parser = subparsers.add_parser('get', help="print a value, e.g. project.meta")
+    get_parser.add_argument('key', help="dotted key path")
+    get_parser.set_defaults(func=cmd_get)
+
+    shell_parser = subparsers.add_parser('shell', help="print project color variables for shell scripts")
+    shell_parser.add_argument('meta', nargs='?', type=int, help="override project.meta")
+    shell_parser.add_argument('etapa', nargs='?', type=int, help="override project.etapa")
+    shell_parser.set_defaults(func=cmd_shell)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+recolor_backgrounds.py - Produce background PNG variants for palette entries without recompiling
+
+The backgrounds only differ between etapas in the pixels drawn with
+projectMainColor (meta text and separator line). Each background is rendered
+once with a black key color and once with a white key color; the difference
+between both renders gives a per-pixel coverage mask (anti-aliased edges
+included), and every palette variant is then a single vectorized blend:
+
+    variant = black_render + coverage * color
+
+Only the rows touched by the mask change between variants, so the PNG data
+for the rows above and below them is deflated once and cached; writing a
+variant only compresses the recolored band.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+
+import generate_background
+import generate_background_pretex
+from project_config import load_config
+from resolve_project_colors import resolve_all_colors
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+# Key colors used to render the two references
+KEY_DARK = '000000'
+KEY_LIGHT = 'ffffff'
+
+# Coverage below this value is treated as rasterizer noise
+MIN_COVERAGE = 1.0 / 255.0
+
+RECOLOR_DIR = os.path.join('build', 'recolor')
+
+# Settings read by the background templates; their font faces are added per template
+COLORS_FILE = os.path.join('settings', 'setcolor_generated.tex')
+TEMPLATE_INPUTS = [os.path.join('settings', 'usepackage.tex'), COLORS_FILE]
+FONT_FACE_RE = re.compile(r'CheltenhamITCPro-[A-Za-z]+')
+# Color definitions except projectMainColor, which the references override
+OTHER_COLORS_RE = re.compile(rb'^\s*\\definecolor\{(?!projectMainColor\}).*$', re.MULTILINE)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+ADLER_BASE = 65521
+
+# Background variants: (name, generator module, output PNG)
+BACKGROUNDS = [
+    ('background', generate_background, 'capas/background.png'),
+    ('background_pretex', generate_background_pretex, 'capas/background_pretex.png'),
+]
+
+def reference_params(config):
+    """Return the generator arguments shared by both background references"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    footer_logo = os.path.join(project_root, config["assets"]["images"]["background_logo"])
+    institution_logo = os.path.join(project_root, config["assets"]["images"]["ita_traco_logo"])
+
+    for path in (footer_logo, institution_logo):
+        if not os.path.exists(path):
+            print(f"❌ Logo not found: {path}")
+            sys.exit(1)
+
+    return {
+        'footer_logo': footer_logo,
+        'product_text': config["project"]["product_text"],
+        'meta_text': config["project"]["meta_text"],
+        'institution_logo': institution_logo,
+    }
+
+def template_inputs(module):
+    """Project files the background template reads: settings and its font faces"""
+    with open(os.path.abspath(module.__file__), 'r', encoding='utf-8') as f:
+        faces = sorted(set(FONT_FACE_RE.findall(f.read())))
+    return TEMPLATE_INPUTS + [os.path.join('fonts', f'{face}.otf') for face in faces]
+
+def color_definitions(data):
+    """Color definitions that affect a reference render, without comments or projectMainColor"""
+    # Switching etapa only changes projectMainColor and the "Current project" comment
+    return b'\n'.join(line.strip() for line in OTHER_COLORS_RE.findall(data))
+
+def reference_key(name, module, params, compress_level):
+    """Hash everything that changes the cached mask (text, logos, template, settings, fonts, level)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    digest = hashlib.sha256(f'{name}:{compress_level}\n'.encode('utf-8'))
+    for key in sorted(params):
+        digest.update(f'{key}={params[key]}\n'.encode('utf-8'))
+    for key in ('footer_logo', 'institution_logo'):
+        stat = os.stat(params[key])
+        digest.update(f'{stat.st_size}:{stat.st_mtime_ns}\n'.encode('utf-8'))
+    with open(os.path.abspath(module.__file__), 'rb') as f:
+        digest.update(f.read())
+
+    for path in template_inputs(module):
+        digest.update(f'{path}\n'.encode('utf-8'))
+        full_path = os.path.join(project_root, path)
+        if not os.path.exists(full_path):
+            continue
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        if path == COLORS_FILE:
+            data = color_definitions(data)
+        digest.update(hashlib.sha256(data).digest())
+    return digest.hexdigest()
+
+def render_reference(name, module, params, key_color):
+    """Render one background with projectMainColor forced to key_color"""
+    tex_path = os.path.join(RECOLOR_DIR, f'{name}_{key_color}.tex')
+    pdf_path = os.path.join(RECOLOR_DIR, f'{name}_{key_color}.pdf')
+    png_path = os.path.join(RECOLOR_DIR, f'{name}_{key_color}.png')
+
+    module.create_latex_file(main_color=key_color, tex_path=tex_path, **params)
+    if not module.compile_pdf(tex_path):
+        print(f"❌ LaTeX compilation failed! Check {tex_path[:-4]}.log for details")
+        return None
+    if not module.convert_to_png(pdf_path, png_path):
+        print(f"❌ PNG conversion failed for {pdf_path}")
+        return None
+    return png_path
+
+def build_mask(dark_png, light_png):
+    """Build the coverage mask from the dark/light key renders"""
+    dark = np.asarray(Image.open(dark_png).convert('RGB'), dtype=np.uint8)
+    light = np.asarray(Image.open(light_png).convert('RGB'), dtype=np.uint8)
+    if dark.shape != light.shape:
+        raise ValueError(f"Reference renders differ in size: {dark.shape} vs {light.shape}")
+
+    # light - dark = coverage * (KEY_LIGHT - KEY_DARK) on every channel
+    diff = light.astype(np.float32) - dark.astype(np.float32)
+    coverage = np.clip(diff.mean(axis=2) / 255.0, 0.0, 1.0)
+    coverage[coverage <= MIN_COVERAGE] = 0.0
+
+    rows = np.flatnonzero(coverage.any(axis=1))
+    cols = np.flatnonzero(coverage.any(axis=0))
+    if rows.size == 0:
+        bbox = np.array([0, 0, 0, 0])
+    else:
+        bbox = np.array([rows[0], rows[-1] + 1, cols[0], cols[-1] + 1])
+    y0, y1, x0, x1 = bbox
+
+    return {
+        'base': dark,
+        'coverage': coverage[y0:y1, x0:x1].astype(np.float32),
+        'bbox': bbox,
+    }
+
+def hex_to_rgb(color_hex):
+    """Convert 'rrggbb' to a float32 RGB vector"""
+    return np.array([int(color_hex[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float32)
+
+def recolor_band(mask, color_hex):
+    """Return the recolored rows y0:y1 (full width) of the background"""
+    y0, y1, x0, x1 = mask['bbox']
+    band = mask['base'][y0:y1].copy()
+    region = band[:, x0:x1].astype(np.float32)
+    region += mask['coverage'][..., None] * hex_to_rgb(color_hex)
+    band[:, x0:x1] = np.clip(np.rint(region), 0, 255).astype(np.uint8)
+    return band
+
+def recolor(mask, color_hex):
+    """Return the whole background array recolored to color_hex"""
+    y0, y1 = mask['bbox'][:2]
+    out = mask['base'].copy()
+    out[y0:y1] = recolor_band(mask, color_hex)
+    return out
+
+# ========================================
+# PNG writer with cached unchanged rows
+# ========================================
+
+def png_rows(array):
+    """Serialize RGB rows as PNG scanlines (filter type 0)"""
+    height = array.shape[0]
+    rows = np.zeros((height, array.shape[1] * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = array.reshape(height, array.shape[1] * 3)
+    return rows.tobytes()
+
+def deflate_part(data, level, final):
+    """Raw-deflate one part of the IDAT stream; non-final parts end byte-aligned"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH)
+
+def adler32_combine(adler1, adler2, len2):
+    """Combine two Adler-32 checksums (port of zlib's adler32_combine)"""
+    rem = len2 % ADLER_BASE
+    sum1 = adler1 & 0xffff
+    sum2 = (rem * sum1) % ADLER_BASE
+    sum1 += (adler2 & 0xffff) + ADLER_BASE - 1
+    sum2 += ((adler1 >> 16) & 0xffff) + ((adler2 >> 16) & 0xffff) + ADLER_BASE - rem
+    sum1 %= ADLER_BASE
+    sum2 %= ADLER_BASE
+    return sum1 | (sum2 << 16)
+
+def png_chunk(kind, data):
+    """Build a PNG chunk with length and CRC"""
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def build_template(mask, compress_level):
+    """Deflate the rows outside the recolored band once"""
+    y0, y1 = mask['bbox'][:2]
+    prefix = png_rows(mask['base'][:y0])
+    suffix = png_rows(mask['base'][y1:])
+    return {
+        'prefix': np.frombuffer(deflate_part(prefix, compress_level, final=False), dtype=np.uint8),
+        'suffix': np.frombuffer(deflate_part(suffix, compress_level, final=True), dtype=np.uint8),
+        'adler': np.array([zlib.adler32(prefix), zlib.adler32(suffix), len(suffix)], dtype=np.int64),
+    }
+
+def write_png(mask, color_hex, path, compress_level):
+    """Write a recolored background, compressing only the recolored band"""
+    height, width = mask['base'].shape[:2]
+    prefix_adler, suffix_adler, suffix_len = (int(v) for v in mask['adler'])
+
+    band = png_rows(recolor_band(mask, color_hex))
+    adler = adler32_combine(zlib.adler32(band, prefix_adler), suffix_adler, suffix_len)
+
+    idat = b''.join([
+        b'\x78\x01',
+        mask['prefix'].tobytes(),
+        deflate_part(band, compress_level, final=False),
+        mask['suffix'].tobytes(),
+        struct.pack('>I', adler),
+    ])
+
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(png_chunk(b'IDAT', idat))
+        f.write(png_chunk(b'IEND', b''))
+
+def load_mask(name, module, params, compress_level, force=False):
+    """Load the cached mask for a background, rendering the references if stale"""
+    os.makedirs(RECOLOR_DIR, exist_ok=True)
+    key = reference_key(name, module, params, compress_level)
+    cache_path = os.path.join(RECOLOR_DIR, f'{name}_mask.npz')
+
+    if not force and os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            if str(cached['key']) == key:
+                return {field: cached[field] for field in cached.files if field != 'key'}
+
+    print(f"🖌️  Rendering {name} references (one-time per layout)...")
+    dark_png = render_reference(name, module, params, KEY_DARK)
+    light_png = render_reference(name, module, params, KEY_LIGHT)
+    if dark_png is None or light_png is None:
+        return None
+
+    mask = build_mask(dark_png, light_png)
+    mask.update(build_template(mask, compress_level))
+    np.savez(cache_path, key=np.array(key), **mask)
+    return mask
+
+def palette_entries(config):
+    """List every (entry name, hex) etapa color of the palette"""
+    entries = []
+    for meta_key, meta_colors in config["colors"]["palette"].items():
+        for etapa_key, color_hex in meta_colors.items():
+            if etapa_key != "coordination":
+                entries.append((f'{meta_key}{etapa_key}', color_hex))
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description="Recolor background PNGs for palette entries")
+    parser.add_argument('--all', action='store_true',
+                        help="write a variant for every palette etapa to --output-dir")
+    parser.add_argument('--entry', action='append', default=[],
+                        help="palette entry to write (e.g. meta1etapa3); repeatable")
+    parser.add_argument('--output-dir', default=os.path.join('capas', 'variants'),
+                        help="directory for palette variants (default: capas/variants)")
+    parser.add_argument('--compress-level', type=int, default=6,
+                        help="PNG zlib level, 0-9 (default: 6)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render the references even if the cached mask is current")
+    args = parser.parse_args()
+
+    if np is None:
+        print("⚠️  NumPy and Pillow are required: pip install numpy pillow")
+        return 1
+
+    print("🎨 Recoloring backgrounds from cached color masks")
+
+    config = load_config()
+    params = reference_params(config)
+    resolved_colors, meta, etapa, palette = resolve_all_colors(config)
+
+    entries = dict(palette_entries(config))
+    if args.all:
+        targets = list(entries.items())
+    else:
+        unknown = [entry for entry in args.entry if entry not in entries]
+        if unknown:
+            print(f"❌ Unknown palette entries: {', '.join(unknown)}")
+            return 1
+        targets = [(entry, entries[entry]) for entry in args.entry]
+
+    masks = {}
+    for name, module, _ in BACKGROUNDS:
+        mask = load_mask(name, module, params, args.compress_level, force=args.force)
+        if mask is None:
+            return 1
+        masks[name] = mask
+
+    start = time.perf_counter()
+    written = 0
+    if not targets:
+        # No entries requested: regenerate the backgrounds the document uses
+        for name, _, output_png in BACKGROUNDS:
+            os.makedirs(os.path.dirname(output_png), exist_ok=True)
+            write_png(masks[name], resolved_colors['project_main'], output_png, args.compress_level)
+            print(f"✅ {output_png} (Meta {meta} Etapa {etapa}, #{resolved_colors['project_main']})")
+            written += 1
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for entry, color_hex in targets:
+            for name, _, _ in BACKGROUNDS:
+                output_png = os.path.join(args.output_dir, f'{name}_{entry}.png')
+                write_png(masks[name], color_hex, output_png, args.compress_level)
+                written += 1
+        print(f"✅ {len(targets)} palette entries written to {args.output_dir}/")
+
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {written} backgrounds in {elapsed:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+reproducible.py - Make the generated PDF byte-reproducible and verify build outputs
+
+Subcommands:
+    pdf FILE...     Pin the PDF trailer /ID and dates to SOURCE_DATE_EPOCH
+    hash FILE...    Print SHA-256 hashes of the given files
+    verify          Build twice and compare the hashes of every output
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+
+# Get absolute path to project root (parent of scripts directory)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Outputs compared by 'verify'
+OUTPUT_GLOBS = ['capas/*.png', 'main.pdf']
+
+PDF_ID_RE = re.compile(rb'/ID\s*\[\s*<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*\]')
+PDF_DATE_RE = re.compile(rb'(/(?:CreationDate|ModDate)\s*\()(D:[^)]*)(\))')
+
+def source_date_epoch():
+    """SOURCE_DATE_EPOCH from the environment, or None"""
+    value = os.environ.get('SOURCE_DATE_EPOCH')
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠️  Ignoring invalid SOURCE_DATE_EPOCH: {value}")
+        return None
+
+def pdf_date(epoch, width):
+    """PDF date string for epoch, in UTC, padded to the width of the original"""
+    stamp = time.strftime('D:%Y%m%d%H%M%S', time.gmtime(epoch))
+    for suffix in ("+00'00'", "+00'00", 'Z', ''):
+        if len(stamp) + len(suffix) == width:
+            return (stamp + suffix).encode('ascii')
+    return None
+
+def fix_pdf(path):
+    """Pin /ID (content hash) and dates (SOURCE_DATE_EPOCH) without moving any byte offset"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    epoch = source_date_epoch()
+    if epoch is not None:
+        def replace_date(match):
+            fixed = pdf_date(epoch, len(match.group(2)))
+            if fixed is None:
+                return match.group(0)
+            return match.group(1) + fixed + match.group(3)
+        data, replaced = PDF_DATE_RE.subn(replace_date, data)
+        if not replaced:
+            print(f"⚠️  No uncompressed CreationDate/ModDate found in {path}; dates not pinned")
+
+    # Hash the document with the IDs blanked, then write the hash back in place
+    matches = list(PDF_ID_RE.finditer(data))
+    if matches:
+        blanked = bytearray(data)
+        for match in matches:
+            for group in (1, 2):
+                start, end = match.span(group)
+                blanked[start:end] = b'0' * (end - start)
+        digest = hashlib.sha256(bytes(blanked)).hexdigest().upper().encode('ascii')
+
+        fixed = bytearray(data)
+        for match in matches:
+            for group in (1, 2):
+                start, end = match.span(group)
+                fixed[start:end] = (digest * 2)[:end - start]
+        data = bytes(fixed)
+
+    with open(path, 'wb') as f:
+        f.write(data)
+    return bool(matches)
+
+def sha256(path):
+    """SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def output_hashes():
+    """Hashes of every build output, keyed by project-relative path"""
+    hashes = {}
+    for pattern in OUTPUT_GLOBS:
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, pattern))):
+            hashes[os.path.relpath(path, PROJECT_ROOT)] = sha256(path)
+    return hashes
+
+# ========================================
+# Subcommands
+# ========================================
+
+def cmd_pdf(args):
+    """Pin PDF IDs and dates"""
+    for path in args.files:
+        if not fix_pdf(path):
+            print(f"⚠️  No trailer /ID found in {path}")
+    return 0
+
+def cmd_hash(args):
+    """Print file hashes"""
+    for path in args.files:
+        print(f"{sha256(path)}  {path}")
+    return 0
+
+def cmd_verify(args):
+    """Build twice and compare output hashes"""
+    runs = []
+    for attempt in (1, 2):
+        print(f"🔁 Reproducibility build {attempt}/2: {args.command}")
+        result = subprocess.run(shlex.split(args.command), cwd=PROJECT_ROOT)
+        if result.returncode != 0:
+            print(f"❌ Build {attempt} failed")
+            return 1
+        runs.append(output_hashes())
+
+    first, second = runs
+    if not first:
+        print("❌ No outputs found to compare")
+        return 1
+
+    mismatches = 0
+    print("=========================================")
+    for path in sorted(set(first) | set(second)):
+        if first.get(path) == second.get(path):
+            print(f"  ✓ {path}  {first[path][:16]}")
+        else:
+            mismatches += 1
+            print(f"  ✗ {path}  {str(first.get(path))[:16]} != {str(second.get(path))[:16]}")
+    print("=========================================")
+
+    if mismatches:
+        print(f"❌ {mismatches} output(s) differ between builds")
+        return 1
+    print("✅ All outputs are byte-identical across builds")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Byte-reproducible build outputs")
+    subparsers = parser.add_subparsers(dest='command_name', required=True)
+
+    pdf_parser = subparsers.add_parser('pdf', help="pin PDF trailer /ID and dates")
+    pdf_parser.add_argument('files', nargs='+')
+    pdf_parser.set_defaults(func=cmd_pdf)
+
+    hash_parser = subparsers.add_parser('hash', help="print SHA-256 hashes")
+    hash_parser.add_argument('files', nargs='+')
+    hash_parser.set_defaults(func=cmd_hash)
+
+    verify_parser = subparsers.add_parser('verify', help="build twice and diff output hashes")
+    verify_parser.add_argument('--command', default='make force',
+                               help="build command to run twice (default: 'make force')")
+    verify_parser.set_defaults(func=cmd_verify)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,21 +5,8 @@ resolve_project_colors.py - Resolve project colors based on meta/etapa configura
 
 import os
 import sys
-import json
 
-def load_config():
-    """Load configuration from JSON file"""
-    # Get absolute path to project root (parent of scripts directory)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    config_path = os.path.join(project_root, 'includes', 'asset_config.json')
-    
-    if not os.path.exists(config_path):
-        print(f"❌ Configuration file not found: {config_path}")
-        sys.exit(1)
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from project_config import load_config
 
 def resolve_color(color_spec, meta, etapa, palette):
     """Resolve a color specification (auto or explicit hex)"""
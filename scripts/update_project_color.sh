@@ -1,50 +1,11 @@
 #!/bin/bash
 # update_project_color.sh - Update the project color based on configuration
 
-# Read Meta and Etapa from JSON config or use command line parameters
-if [ -f "includes/asset_config.json" ]; then
-    # Extract meta and etapa numbers from meta_text in JSON
-    META_TEXT=$(grep '"meta_text"' includes/asset_config.json | sed 's/.*"meta_text": *"\([^"]*\)".*/\1/')
-    PROJECT_META=$(echo "$META_TEXT" | sed 's/.*Meta \([0-9]*\).*/\1/' 2>/dev/null || echo "2")
-    PROJECT_ETAPA=$(echo "$META_TEXT" | sed 's/.*Etapa \([0-9]*\).*/\1/' 2>/dev/null || echo "2")
-else
-    PROJECT_META="${1:-2}"
-    PROJECT_ETAPA="${2:-2}"
-fi
-
-# Define the official color codes
-declare -A COLORS
-
-# Meta 1 colors
-COLORS["1,coord"]="272a6a"
-COLORS["1,1"]="283880"
-COLORS["1,2"]="204196"
-COLORS["1,3"]="2451a4"
-COLORS["1,4"]="2b61ae"
-COLORS["1,5"]="2d72ba"
-COLORS["1,6"]="2f84c6"
-
-# Meta 2 colors
-COLORS["2,coord"]="388fcd"
-COLORS["2,1"]="388fcd"
-COLORS["2,2"]="6597ca"
-COLORS["2,3"]="6392bd"
-COLORS["2,4"]="618eb1"
-COLORS["2,5"]="5e89a7"
-COLORS["2,6"]="5c859c"
-COLORS["2,7"]="4d7d94"
-COLORS["2,8"]="3f738b"
-COLORS["2,9"]="306983"
-COLORS["2,10"]="215f7b"
-
-# Get the color for the specified Meta and Etapa
-COLOR_KEY="${PROJECT_META},${PROJECT_ETAPA}"
-PROJECT_COLOR="${COLORS[$COLOR_KEY]}"
-
-if [ -z "$PROJECT_COLOR" ]; then
-    echo "Error: Invalid Meta ($PROJECT_META) or Etapa ($PROJECT_ETAPA)"
-    exit 1
-fi
+# Meta, Etapa and color come from the validated includes/asset_config.json
+# (command line parameters override Meta and Etapa)
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+CONFIG_VARS=$(python3 "$SCRIPT_DIR/project_config.py" shell "$@") || exit 1
+eval "$CONFIG_VARS"
 
 # Update the projectMainColor in setcolor.tex
 SETCOLOR_FILE="settings/setcolor.tex"